@@ -6,95 +6,141 @@ Last modified: Lori Garzio on 6/21/2021
 Returns a dictionary of all forecast storm tracks, cones, and best tracks for the current day from
 'https://www.nhc.noaa.gov/gis/'
 """
+import concurrent.futures
+import io
 import os
+import re
 import numpy as np
 import datetime as dt
-import glob
 import requests
-import urllib.request
-from bs4 import BeautifulSoup
+import shutil
+from lxml import etree
 from zipfile import ZipFile
 
 
+def download_file(session, url, file_name):
+    # stream the response to disk so the whole file is not buffered in memory
+    with session.get(url, stream=True) as r:
+        r.raise_for_status()
+        with open(file_name, 'wb') as f:
+            shutil.copyfileobj(r.raw, f)
+
+
 def download_current_kmz(tini, save_dir):
     url_nhc = 'https://www.nhc.noaa.gov/gis/'
-    r = requests.get(url_nhc)
-    data = r.text
-
-    soup = BeautifulSoup(data, 'html.parser')
-
-    for i, s in enumerate(soup.find_all('a')):
-        ff = s.get('href')
-        if type(ff) == str:
-            if np.logical_and('kmz' in ff, str(tini.year) in ff):
-                print(i)
-                if 'CONE_latest' in ff:
-                    os.makedirs(save_dir, exist_ok=True)
-                    file_name = ff.split('/')[3]
-                    print(ff, file_name)
-                    if not os.path.isfile(os.path.join(save_dir, file_name)):
-                        urllib.request.urlretrieve(url_nhc[:-4] + ff, os.path.join(save_dir, file_name))
-                if 'TRACK_latest' in ff:
-                    os.makedirs(save_dir, exist_ok=True)
-                    file_name = ff.split('/')[3]
-                    print(ff, file_name)
-                    if not os.path.isfile(os.path.join(save_dir, file_name)):
-                        urllib.request.urlretrieve(url_nhc[:-4] + ff, os.path.join(save_dir, file_name))
-                if 'best_track' in ff:
-                    os.makedirs(save_dir, exist_ok=True)
-                    file_name = ff.split('/')[1]
-                    print(ff, file_name)
-                    if not os.path.isfile(os.path.join(save_dir, file_name)):
-                        urllib.request.urlretrieve(url_nhc + ff, os.path.join(save_dir, file_name))
+
+    # reuse one connection pool to the NHC server for the index page and all of the kmz files
+    with requests.Session() as session:
+        r = session.get(url_nhc)
+        data = r.text
+
+        # only the kmz links for this year are needed, so pull them straight from the page instead of parsing the html
+        kmz_links = re.compile(r'href="([^"]*{}[^"]*kmz[^"]*)"'.format(tini.year))
+
+        # find the kmz files that need to be downloaded
+        downloads = dict()
+        for ff in kmz_links.findall(data):
+            if np.logical_or('CONE_latest' in ff, 'TRACK_latest' in ff):
+                file_name = ff.split('/')[3]
+                url = url_nhc[:-4] + ff
+            elif 'best_track' in ff:
+                file_name = ff.split('/')[1]
+                url = url_nhc + ff
+            else:
+                continue
+            print(ff, file_name)
+            if not os.path.isfile(os.path.join(save_dir, file_name)):
+                downloads[os.path.join(save_dir, file_name)] = url
+
+        if len(downloads) > 0:
+            os.makedirs(save_dir, exist_ok=True)
+
+            # downloads are network-bound, so fetch them concurrently
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                futures = [executor.submit(download_file, session, url, file_name) for file_name, url in downloads.items()]
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
 
 
 def get_cone_coordinates(kml_file):
-    soup = BeautifulSoup(kml_file, 'html.parser')
-    cone = dict(lon=np.array([]), lat=np.array([]))
-    for i, s in enumerate(soup.find_all("coordinates")):
-        coor = s.get_text('coordinates').split(',0')
-        for st in coor[1:-1]:
-            lon = float(st.split(',')[0])
-            lat = float(st.split(',')[1])
-            cone['lon'] = np.append(cone['lon'], lon)
-            cone['lat'] = np.append(cone['lat'], lat)
-    return cone
+    lons = []
+    lats = []
+    for event, elem in etree.iterparse(io.BytesIO(kml_file), tag='{*}coordinates'):
+        # coordinates are whitespace-separated lon,lat,alt triples
+        coor = np.fromstring(elem.text.replace(',', ' '), dtype=np.float64, sep=' ').reshape(-1, 3)
+        lons.append(coor[:, 0])
+        lats.append(coor[:, 1])
+
+        # free the parsed element and any siblings already processed
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+    if len(lons) < 1:
+        return dict(lon=np.array([]), lat=np.array([]))
+    return dict(lon=np.concatenate(lons), lat=np.concatenate(lats))
 
 
 def get_track_coordinates(kml_file):
-    soup = BeautifulSoup(kml_file, 'html.parser')
-    track = dict(lon=np.array([]), lat=np.array([]))
-    for i, s in enumerate(soup.find_all("point")):
-        lon = float(s.get_text("coordinates").split('coordinates')[1].split(',')[0])
-        lat = float(s.get_text("coordinates").split('coordinates')[1].split(',')[1])
-        track['lon'] = np.append(track['lon'], lon)
-        track['lat'] = np.append(track['lat'], lat)
-    return track
+    lons = []
+    lats = []
+    for event, elem in etree.iterparse(io.BytesIO(kml_file), tag='{*}Point'):
+        st = elem.findtext('{*}coordinates').strip()
+        lon, lat = st.split(',')[0:2]
+        lons.append(float(lon))
+        lats.append(float(lat))
+
+        # free the parsed element and any siblings already processed
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    return dict(lon=np.asarray(lons), lat=np.asarray(lats))
 
 
 def main(now, save_dir):
     sdir = os.path.join(save_dir, now.strftime('%Y%m'), now.strftime('%Y%m%d'), now.strftime('%Y%m%dT%H'), 'kmz')
     download_current_kmz(now, sdir)
 
-    kmz_files = glob.glob(os.path.join(save_dir, '*.kmz'))
+    # sort the downloaded files in a single pass over the directory
+    kmz_files = []
+    zip_files_track_latest = []
+    cones = dict()
+    best_tracks = dict()
+    if os.path.isdir(sdir):
+        with os.scandir(sdir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.kmz'):
+                    continue
+                kmz_files.append(entry.path)
+
+                # index Atlantic storm files by storm code, e.g. AL092021_CONE_latest.kmz and al092021_best_track.kmz
+                code = entry.name.split('_')[0].upper()
+                if not code.startswith('AL'):
+                    continue
+                if 'TRACK' in entry.name:
+                    zip_files_track_latest.append(entry.path)
+                elif 'CONE' in entry.name:
+                    cones[code] = entry.path
+                elif 'best_track' in entry.name:
+                    best_tracks[code] = entry.path
+
     if len(kmz_files) > 0:
+        # kmz files are zip archives, so extract them in-process rather than copying to .zip and shelling out.
+        # read the kml while the archive is open so each kmz is only opened once
+        kml_data = dict()
         for f in kmz_files:
-            os.system('cp ' + f + ' ' + f[:-3] + 'zip')
-            os.system('unzip -o ' + f + ' -d ' + f[:-4])
-
-        zip_files = glob.glob(os.path.join(save_dir, '*.zip'))
-        zip_files = [f for f in zip_files if np.logical_or('al' in f, 'AL' in f)]
-        zip_files_track_latest = [f for f in zip_files if 'TRACK' in f]
+            with ZipFile(f, 'r') as z:
+                z.extractall(f[:-4])
+                kml_name = [n for n in z.namelist() if n.endswith('.kml')][0]
+                kml_data[f] = z.read(kml_name)
 
         tracks = dict()
         for i, f in enumerate(zip_files_track_latest):
             name = f.split('/')[-1].split('_')[0]
             tracks[name] = dict()
             tracks[name]['forecast_time'] = now
-            kmz = ZipFile(f, 'r')
             if 'TRACK' in f:
-                kml_f = glob.glob(f[:-4] + '/*.kml')
-                kml_track = kmz.open(kml_f[0].split('/')[-1], 'r').read()
+                kml_track = kml_data[f]
 
                 # Get forecast track coordinates
                 tracks[name]['forecast_track'] = get_track_coordinates(kml_track)
@@ -103,10 +149,8 @@ def main(now, save_dir):
                 tracks[name]['forecast_track']['plt'] = dict(ls='-.', color='gold', lw=2, name='Forecast Track')
 
                 # Get CONE coordinates
-                zip_file_cone_latest = [fl for fl in zip_files if np.logical_and(name in fl, 'CONE' in fl)][0]
-                kmz = ZipFile(zip_file_cone_latest, 'r')
-                kml_ff = glob.glob(os.path.join(sdir, zip_file_cone_latest.split('/')[-1][:-4]+'/*.kml'))
-                kml_cone_latest = kmz.open(kml_ff[0].split('/')[-1], 'r').read()
+                zip_file_cone_latest = cones[name.upper()]
+                kml_cone_latest = kml_data[zip_file_cone_latest]
 
                 tracks[name]['forecast_cone'] = get_cone_coordinates(kml_cone_latest)
 
@@ -114,10 +158,8 @@ def main(now, save_dir):
                 tracks[name]['forecast_cone']['plt'] = dict(ls='-.', color='blue', lw=1, name='Forecast Cone')
 
                 # Get best track coordinates
-                zip_file_best_track = [fl for fl in zip_files if np.logical_and(name.lower() in fl, 'best_track' in fl)][0]
-                kmz = ZipFile(zip_file_best_track, 'r')
-                kml_ff = glob.glob(os.path.join(sdir, zip_file_best_track.split('/')[-1][:-4]+'/*.kml'))
-                kml_best_track = kmz.open(kml_ff[0].split('/')[-1], 'r').read()
+                zip_file_best_track = best_tracks[name.upper()]
+                kml_best_track = kml_data[zip_file_best_track]
 
                 tracks[name]['best_track'] = get_track_coordinates(kml_best_track)
 
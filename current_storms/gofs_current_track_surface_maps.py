@@ -11,7 +11,7 @@ import pandas as pd
 import os
 import cartopy.crs as ccrs
 import datetime as dt
-from hurricanes.platforms import get_argo_data, forecast_storm_region
+from hurricanes.storms import get_argo_data, forecast_storm_region, argo_summary
 from hurricanes.storms_plt import surface_map_storm_forecast
 from current_storms import current_forecast_track
 import hurricanes.gliders as gld
@@ -49,6 +49,10 @@ kwargs['model'] = 'gofs'
 kwargs['transform'] = map_projection
 kwargs['dpi'] = dpi
 
+# cache argo and glider queries for this run, storms often share the same regions
+argo_cache = dict()
+glider_cache = dict()
+
 if bathymetry:
     bathy = xr.open_dataset(bathymetry)
 else:
@@ -77,20 +81,22 @@ if forecast_tracks:
                                                 lat=slice(extent[2] - 1, extent[3] + 1))
 
                 if argo:
-                    argo_data = get_argo_data(extent, t0, t1)
+                    if tuple(extent) not in argo_cache:
+                        argo_cache[tuple(extent)] = get_argo_data(extent, t0, t1)
+                    argo_data = argo_cache[tuple(extent)]
                     if len(argo_data) > 0:
                         kwargs['argo'] = argo_data
 
-                        argo_df = pd.DataFrame(argo_data)
-                        argo_df.sort_values('time', inplace=True)
                         argo_savename = '{}_{}_argo_{}-{}.csv'.format(tracks[0], region[1]['code'],
                                                                       t0.strftime('%Y%m%d'), t1.strftime('%Y%m%d'))
-                        argo_df.to_csv(os.path.join(sdir_track, argo_savename), index=False)
+                        argo_summary(argo_data, os.path.join(sdir_track, argo_savename))
                     else:
                         kwargs['argo'] = False
 
                 if gliders:
-                    current_gliders = gld.glider_data(extent, t0, t1)
+                    if tuple(extent) not in glider_cache:
+                        glider_cache[tuple(extent)] = gld.glider_data(extent, t0, t1)
+                    current_gliders = glider_cache[tuple(extent)]
                     if len(current_gliders) > 0:
                         kwargs['gliders'] = current_gliders
                         gl_savename = '{}_{}_gliders_{}-{}.csv'.format(tracks[0], region[1]['code'],
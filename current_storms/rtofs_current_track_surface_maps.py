@@ -13,12 +13,36 @@ import os
 import datetime as dt
 import numpy as np
 from glob import glob
-from hurricanes.storms import get_argo_data, forecast_storm_region
+from hurricanes.storms import get_argo_data, forecast_storm_region, argo_summary
 from hurricanes.storms_plt import surface_map_storm_forecast
 from current_storms import current_forecast_track
 import hurricanes.gliders as gld
 pd.set_option('display.width', 320, "display.max_columns", 10)  # for display in pycharm console
 
+
+def open_rtofs(files):
+    """
+    Open all of the RTOFS forecast files at once so dask can read and subset them in parallel. If a file can't be
+    read, it is skipped and the rest are opened, so one truncated file doesn't stop the whole run
+    """
+    kwargs = dict(concat_dim='MT', combine='nested', data_vars='minimal', coords='minimal', compat='override',
+                  parallel=True, chunks={'MT': 1, 'Depth': 1})
+    try:
+        return xr.open_mfdataset(files, **kwargs)
+    except (OSError, ValueError):
+        # only check the files one at a time when opening them all together fails
+        good = []
+        for f in files:
+            try:
+                with xr.open_dataset(f):
+                    good.append(f)
+            except (OSError, ValueError):
+                print('Unable to open RTOFS file: {}'.format(f))
+        if len(good) < 1:
+            return None
+        return xr.open_mfdataset(good, **kwargs)
+
+
 # url = '/Users/garzio/Documents/rucool/hurricane_glider_project/RTOFS/RTOFS_6hourly_North_Atlantic/'
 url = '/home/hurricaneadm/data/rtofs'  # on server
 # save_dir = '/Users/garzio/Documents/rucool/hurricane_glider_project/current_storm_tracks'
@@ -46,6 +70,10 @@ kwargs['model'] = 'rtofs'
 kwargs['transform'] = map_projection
 kwargs['dpi'] = dpi
 
+# cache argo and glider queries for this run, storms often share the same regions
+argo_cache = dict()
+glider_cache = dict()
+
 if bathymetry:
     bathy = xr.open_dataset(bathymetry)
 else:
@@ -54,15 +82,37 @@ else:
 # get forecast tracks for today
 forecast_tracks = current_forecast_track.main(now, save_dir)
 
+rtofs_files = []
 if forecast_tracks:
     # define times to grab RTOFS data
     date_list = [today - dt.timedelta(days=x) for x in range(days)]
     rtofs_files = [glob(os.path.join(url, x.strftime('rtofs.%Y%m%d'), '*.nc')) for x in date_list]
     rtofs_files = sorted([inner for outer in rtofs_files for inner in outer])
 
-    # get RTOFS files for 0Z on the first day
-    md = (dt.datetime.strptime(rtofs_files[0].split('/')[-2].split('.')[-1], '%Y%m%d') - dt.timedelta(days=1)).strftime('rtofs.%Y%m%d')
-    rtofs_files.insert(0, os.path.join(url, md, 'rtofs_glo_3dz_f024_6hrly_hvr_US_east.nc'))
+    if len(rtofs_files) > 0:
+        # get RTOFS files for 0Z on the first day
+        md = (dt.datetime.strptime(rtofs_files[0].split('/')[-2].split('.')[-1], '%Y%m%d') - dt.timedelta(days=1)).strftime('rtofs.%Y%m%d')
+        rtofs_files.insert(0, os.path.join(url, md, 'rtofs_glo_3dz_f024_6hrly_hvr_US_east.nc'))
+        rtofs_files = [f for f in rtofs_files if os.path.isfile(f) and os.path.getsize(f) > 0]
+
+rtofs = open_rtofs(rtofs_files) if len(rtofs_files) > 0 else None
+if forecast_tracks and rtofs is None:
+    print('No RTOFS files found')
+
+if rtofs is not None:
+    rtofs = rtofs.rename({'Longitude': 'lon', 'Latitude': 'lat', 'MT': 'time', 'Depth': 'depth'})
+
+    # only read one row/column of the 2D lon/lat grid instead of the full arrays
+    lon = rtofs.lon.isel(Y=0).values
+    lat = rtofs.lat.isel(X=0).values
+
+    # if the grid is rectilinear, replace the 2D lon/lat grids with their 1D marginals. these broadcast against the
+    # (Y, X) data when plotting, so the full nx*ny coordinate arrays never need to be read or stored
+    if np.array_equal(lon, rtofs.lon.isel(Y=-1).values) and np.array_equal(lat, rtofs.lat.isel(X=-1).values):
+        rtofs = rtofs.drop_vars(['lon', 'lat']).assign_coords(lon=('X', lon), lat=('Y', lat))
+
+    # RTOFS grid slices for each region extent, regions are often shared between storms
+    extent_slices = dict()
 
     for tracks in forecast_tracks.items():
         kwargs['forecast'] = tracks
@@ -83,20 +133,22 @@ if forecast_tracks:
                                                 lat=slice(extent[2] - 1, extent[3] + 1))
 
                 if argo:
-                    argo_data = get_argo_data(extent, t0, t1)
+                    if tuple(extent) not in argo_cache:
+                        argo_cache[tuple(extent)] = get_argo_data(extent, t0, t1)
+                    argo_data = argo_cache[tuple(extent)]
                     if len(argo_data) > 0:
                         kwargs['argo'] = argo_data
 
-                        argo_df = pd.DataFrame(argo_data)
-                        argo_df.sort_values('time', inplace=True)
                         argo_savename = '{}_{}_argo_{}-{}.csv'.format(tracks[0], region[1]['code'],
                                                                       t0.strftime('%Y%m%d'), t1.strftime('%Y%m%d'))
-                        argo_df.to_csv(os.path.join(sdir_track, argo_savename), index=False)
+                        argo_summary(argo_data, os.path.join(sdir_track, argo_savename))
                     else:
                         kwargs['argo'] = False
 
                 if gliders:
-                    current_gliders = gld.glider_data(extent, t0, t1)
+                    if tuple(extent) not in glider_cache:
+                        glider_cache[tuple(extent)] = gld.glider_data(extent, t0, t1)
+                    current_gliders = glider_cache[tuple(extent)]
                     if len(current_gliders) > 0:
                         kwargs['gliders'] = current_gliders
                         gl_savename = '{}_{}_gliders_{}-{}.csv'.format(tracks[0], region[1]['code'],
@@ -105,20 +157,16 @@ if forecast_tracks:
                     else:
                         kwargs['gliders'] = False
 
-                for f in rtofs_files:
-                    print(f)
-                    try:
-                        with xr.open_dataset(f) as ds:
-                            ds = ds.rename({'Longitude': 'lon', 'Latitude': 'lat', 'MT': 'time', 'Depth': 'depth'})
-                            lat = ds.lat.data
-                            lon = ds.lon.data
-
-                            # subset the RTOFS grid
-                            lonidx = [extent[0] - 1, extent[1] + 1]
-                            latidx = [extent[2] - 2, extent[3] + 2]
-                            lonIndex = np.round(np.interp(lonidx, lon[0, :], np.arange(0, len(lon[0, :])))).astype(int)
-                            latIndex = np.round(np.interp(latidx, lat[:, 0], np.arange(0, len(lat[:, 0])))).astype(int)
-                            sub = ds.sel(X=slice(lonIndex[0], lonIndex[1]), Y=slice(latIndex[0], latIndex[1]))
-                            surface_map_storm_forecast(sub, region, **kwargs)
-                    except OSError:
-                        continue
+                # subset the RTOFS grid, the grid is the same for every forecast so only find the indices once per extent
+                if tuple(extent) not in extent_slices:
+                    lonidx = [extent[0] - 1, extent[1] + 1]
+                    latidx = [extent[2] - 2, extent[3] + 2]
+                    lonIndex = np.searchsorted(lon, lonidx)
+                    latIndex = np.searchsorted(lat, latidx)
+                    extent_slices[tuple(extent)] = (slice(lonIndex[0], lonIndex[1] + 1),
+                                                    slice(latIndex[0], latIndex[1] + 1))
+                slx, sly = extent_slices[tuple(extent)]
+                sub = rtofs.isel(X=slx, Y=sly)
+                for i in range(len(sub.time)):
+                    print(pd.to_datetime(sub.time.data[i]))
+                    surface_map_storm_forecast(sub.isel(time=[i]), region, **kwargs)
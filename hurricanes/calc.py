@@ -146,6 +146,36 @@ def lon360to180(array):
     array = np.array(array)
     return np.mod(array+180, 360)-180
 
+def extent_to_ij(extent, grid_lons, grid_lats):
+    """
+    Find the x and y index slices of a rectilinear grid that cover an extent. The
+    first index of each slice is rounded down and the second is rounded up in
+    order to widen the area of the extent slightly.
+
+    Args:
+        extent (list): [lonmin, lonmax, latmin, latmax]
+        grid_lons (np.array): monotonic longitudes of the grid columns
+        grid_lats (np.array): monotonic latitudes of the grid rows
+
+    Returns:
+        tuple: x slice, y slice
+    """
+    return _bounds_to_slice(extent[:2], grid_lons), _bounds_to_slice(extent[2:], grid_lats)
+
+
+def _bounds_to_slice(bounds, grid):
+    spacing = np.diff(grid)
+    if np.allclose(spacing, spacing[0]):
+        # Uniform grid: the fractional index can be calculated directly
+        ind = (np.asarray(bounds) - grid[0]) / spacing[0]
+        i0, i1 = np.floor(ind[0]), np.ceil(ind[1])
+    else:
+        i0 = np.searchsorted(grid, bounds[0], side='right') - 1
+        i1 = np.searchsorted(grid, bounds[1], side='left')
+    i0, i1 = np.clip([i0, i1], 0, len(grid) - 1).astype(int)
+    return slice(i0, i1)
+
+
 def find_nearest(array, value):
     """
     Find the index of closest value in array
@@ -21,6 +21,7 @@ elif platform == "darwin":
 
 # Paths to data sources
 path_data = current_dir.with_name('data') # data path relative to the toolbox 
+path_cache = path_data / 'cache' # local copies of remote data
 
 # Configurations for contour maps 
 regions = [
@@ -25,7 +25,10 @@ def rtofs():
 
 def gofs(rename=False):
     url = "https://tds.hycom.org/thredds/dodsC/GLBy0.08/expt_93.0"
-    ds = xr.open_dataset(url, drop_variables="tau")
+    ds = xr.open_dataset(
+        url,
+        drop_variables=["tau", "water_temp_bottom", "salinity_bottom", "water_u_bottom", "water_v_bottom"]
+        )
     ds.attrs['model'] = 'GOFS'
     if rename:
         ds = ds.rename(
@@ -57,7 +60,10 @@ def cmems(rename=False):
         data_store = xr.backends.PydapDataStore(open_url(url, session=session, user_charset='utf-8')) # needs PyDAP >= v3.3.0 see https://github.com/pydap/pydap/pull/223/commits
 
     # Downloading and reading Copernicus grid
-    ds = xr.open_dataset(data_store, drop_variables='tau')
+    ds = xr.open_dataset(
+        data_store,
+        drop_variables=['tau', 'mlotst', 'bottomT', 'sithick', 'siconc', 'usi', 'vsi']
+        )
     ds.attrs['model'] = 'CMEMS'
 
     if rename:
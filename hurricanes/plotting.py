@@ -28,6 +28,9 @@ proj = dict(
     data=ccrs.PlateCarree() # the projection that the data is. 
     )
 
+# Base maps for model comparison figures, keyed by region
+_REGION_FIGURES = {}
+
 def export_fig(path, fname, script=None, dpi=150):
     """
     Helper function to save a figure with some nice formatting.
@@ -728,76 +731,24 @@ def plot_model_region_comparison(ds1, ds2, region,
     year = time.strftime("%Y")
     month = time.strftime("%m")
 
-    # Create subdirectory for region
-    # region_file_str = ('_').join(region_name.lower().split(' '))
-    # path_save_region = path_save / region['folder']
-    
-    # # Create a map figure and serialize it if one doesn't already exist
-    # region_name = "_".join(region["name"].split(' ')).lower()
-    # mdir = path_save / "mapfigs"
-    # os.makedirs(mdir, exist_ok=True)
-    # sfig = mdir / f"{region_name}_fig.pkl"
-
-    # if not sfig.exists():
-    # Create figure
-
-    grid = """
-    RG
-    LL
-    """
-
-    fig, _ = plt.subplot_mosaic(
-        grid,
-        figsize=figsize,
-        layout="constrained",
-        subplot_kw={
-            'projection': transform['map']
-            },
-        gridspec_kw={
-            # set the height ratios between the rows
-            "height_ratios": [4, 1],
-            # set the width ratios between the columns
-            # # "width_ratios": [1],
-            },
-        )
-    axs = fig.axes
+    # Reuse the base map for this region if it was already drawn
+    key = (region['name'], tuple(extent), tuple(figsize), transform['map'], bathy is not None)
+    if key not in _REGION_FIGURES:
+        _REGION_FIGURES[key] = _region_comparison_figure(extent, bathy, figsize, transform)
+    fig, axs, baseline = _REGION_FIGURES[key]
     ax1 = axs[0] # Model 1
     ax2 = axs[1] # Model 2
     ax3 = axs[2] # Legend for argo/gliders
-            
-    # Make the map pretty
-    map_add_features(ax1, extent)# zorder=0)
-    map_add_features(ax2, extent)# zorder=0)
-
-    # Add bathymetry lines
-    if bathy:
-        map_add_bathymetry(ax1,
-                           bathy.longitude.values, 
-                           bathy.latitude.values, 
-                           bathy.elevation.values,
-                           levels=(-1000, -100),
-                           zorder=1.5)
-        map_add_bathymetry(ax2,
-                           bathy.longitude.values, 
-                           bathy.latitude.values, 
-                           bathy.elevation.values,
-                           levels=(-1000, -100),
-                           zorder=1.5)
-
-    # Add ticks
-    map_add_ticks(ax1, extent, label_left=True)
-    map_add_ticks(ax2, extent, label_left=False, label_right=True)
 
+    # Remove anything left over from the last time the base map was used
+    for cax in fig.axes:
+        if cax not in axs:
+            cax.remove()
 
-    #             with open(sfig, 'wb') as file:
-    #                 pickle.dump(fig, file)
-    # else:
-    #     with open(sfig, "rb") as file:
-    #         fig = pickle.load(file)
-    #         axs = fig.axes
-    #         ax1 = axs[0]
-    #         ax2 = axs[1]
-    #         ax3 = axs[2]
+    for ax, children in zip(axs, baseline):
+        for artist in ax.get_children():
+            if artist not in children:
+                artist.remove()
 
     # Plot gliders and argo floats
     rargs = {}
@@ -810,9 +761,10 @@ def plot_model_region_comparison(ds1, ds2, region,
     # Label the subplots
     ax1.set_title(ds1.model, fontsize=16, fontweight="bold")
     ax2.set_title(ds2.model, fontsize=16, fontweight="bold")
-    txt = plt.suptitle("", fontsize=22, fontweight="bold")
+    txt = fig.suptitle("", fontsize=22, fontweight="bold")
     
-    # Deal with the third axes
+    # Deal with the third axes. Clear the search window title left from the last time the base map was used
+    ax3.set_title("", loc="center")
     h, l = ax1.get_legend_handles_labels()  # get labels and handles from ax1
     if (len(h) > 0) & (len(l) > 0):
         
@@ -945,7 +897,61 @@ def plot_model_region_comparison(ds1, ds2, region,
                 eez1.remove()
                 eez2.remove()            
 
-            plt.close()
+
+def _region_comparison_figure(extent, bathy, figsize, transform):
+    """
+    Draw the parts of a model comparison figure that only depend on the region.
+    Returns the figure, its axes, and the artists on each axes after drawing.
+    """
+    grid = """
+    RG
+    LL
+    """
+
+    fig, _ = plt.subplot_mosaic(
+        grid,
+        figsize=figsize,
+        layout="constrained",
+        subplot_kw={
+            'projection': transform['map']
+            },
+        gridspec_kw={
+            # set the height ratios between the rows
+            "height_ratios": [4, 1],
+            # set the width ratios between the columns
+            # # "width_ratios": [1],
+            },
+        )
+    ax1, ax2, ax3 = fig.axes
+
+    # Make the map pretty
+    map_add_features(ax1, extent)# zorder=0)
+    map_add_features(ax2, extent)# zorder=0)
+
+    # Add bathymetry lines
+    if bathy:
+        map_add_bathymetry(ax1,
+                           bathy.longitude.values, 
+                           bathy.latitude.values, 
+                           bathy.elevation.values,
+                           levels=(-1000, -100),
+                           zorder=1.5)
+        map_add_bathymetry(ax2,
+                           bathy.longitude.values, 
+                           bathy.latitude.values, 
+                           bathy.elevation.values,
+                           levels=(-1000, -100),
+                           zorder=1.5)
+
+    # Add ticks
+    map_add_ticks(ax1, extent, label_left=True)
+    map_add_ticks(ax2, extent, label_left=False, label_right=True)
+    ax3.set_axis_off()
+
+    # Remove the figure from pyplot so it isn't closed along with other figures
+    plt.close(fig)
+    axs = fig.axes
+    return fig, axs, [set(ax.get_children()) for ax in axs]
 
 
 def plot_regional_assets(ax, argo=None, gliders=None, 
@@ -1366,7 +1372,7 @@ def salinity_max(ds, extent, region_name,
     ax3.set_axis_off()
 
     # Calculate contours
-    if limits:
+    if limits is not None:
         salt_min = limits[0]
         salt_max = limits[1]
         salt_stride = limits[2]
@@ -1601,7 +1607,7 @@ def plot_ohc(ds1, ds2, extent, region_name,
     ax3.set_axis_off()
 
     # Calculate contours
-    if limits:
+    if limits is not None:
         ohc_min = limits[0]
         ohc_max = limits[1]
         ohc_stride = limits[2]
@@ -5,6 +5,7 @@ Author: Lori Garzio on 2/19/2021
 Last modified: 4/27/2021
 Tools for analyzing specific storms
 """
+import csv
 import pandas as pd
 import numpy as np
 import xarray as xr
@@ -15,27 +16,13 @@ from hurricanes.platforms import active_argo_floats
 
 
 def convert_target_gofs_lon(target_lon):
-    target_convert = np.array([])
-    if np.logical_or(isinstance(target_lon, float), isinstance(target_lon, int)):
-        target_lon = np.array([target_lon])
-    for tc in target_lon:
-        if tc < 0:
-            target_convert = np.append(target_convert, 360 + tc)
-        else:
-            target_convert = np.append(target_convert, tc)
-    return target_convert
+    target_lon = np.atleast_1d(np.asarray(target_lon, dtype=np.float64))
+    return np.where(target_lon < 0, 360 + target_lon, target_lon)
 
 
 def convert_gofs_target_lon(gofs_lon):
-    gofslon_convert = np.array([])
-    if np.logical_or(isinstance(gofs_lon, float), isinstance(gofs_lon, int)):
-        gofs_lon = np.array([gofs_lon])
-    for gl in gofs_lon:
-        if gl > 180:
-            gofslon_convert = np.append(gofslon_convert, gl - 360)
-        else:
-            gofslon_convert = np.append(gofslon_convert, gl)
-    return gofslon_convert
+    gofs_lon = np.atleast_1d(np.asarray(gofs_lon, dtype=np.float64))
+    return np.where(gofs_lon > 180, gofs_lon - 360, gofs_lon)
 
 
 def custom_transect(ds, variables, target_lons, target_lats, model):
@@ -62,15 +49,16 @@ def custom_transect(ds, variables, target_lons, target_lats, model):
         lon_idx = np.round(np.interp(target_lons, lon[0, :], np.arange(0, len(lon[0, :])))).astype(int)
         lat_idx = np.round(np.interp(target_lats, lat[:, 0], np.arange(0, len(lat[:, 0])))).astype(int)
 
-    lonlat_check = []
-    lon_idx_final = np.array([], dtype='int32')
-    lat_idx_final = np.array([], dtype='int32')
-    for i, value in enumerate(lon_idx):
-        lonlat = [value, lat_idx[i]]
+    lonlat_check = set()
+    lon_idx_final = []
+    lat_idx_final = []
+    for lonlat in zip(lon_idx, lat_idx):
         if lonlat not in lonlat_check:
-            lonlat_check.append(lonlat)
-            lon_idx_final = np.append(lon_idx_final, value)
-            lat_idx_final = np.append(lat_idx_final, lat_idx[i])
+            lonlat_check.add(lonlat)
+            lon_idx_final.append(lonlat[0])
+            lat_idx_final.append(lonlat[1])
+    lon_idx_final = np.asarray(lon_idx_final, dtype='int32')
+    lat_idx_final = np.asarray(lat_idx_final, dtype='int32')
 
     if model in ['gofs', 'cmems']:
         lon_subset = lon[lon_idx_final]
@@ -173,6 +161,16 @@ def get_argo_data(extent, t0, t1):
     return argo_floats
 
 
+def argo_summary(argo_data, savefile):
+    """
+    Save the most recent position of each argo float returned by get_argo_data, sorted by time
+    """
+    with open(savefile, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(argo_data[0]._fields)
+        writer.writerows(sorted(argo_data, key=lambda x: x.time))
+
+
 def return_ibtracs_storm(fname, storm_idx, variables):
     ibnc = xr.open_dataset(fname, mask_and_scale=False)
     nc = ibnc.sel(storm=storm_idx)
@@ -194,8 +192,8 @@ def return_ibtracs_storm(fname, storm_idx, variables):
 
 def return_target_transect(target_lons, target_lats):
     # return a more dense target transect than provided by storm forecast or IBTrACS coordinates
-    targetlon = np.array([])
-    targetlat = np.array([])
+    targetlon = [np.array([])]
+    targetlat = [np.array([])]
     for ii, tl in enumerate(target_lons):
         if ii > 0:
             x1 = tl
@@ -208,8 +206,8 @@ def return_target_transect(target_lons, target_lats):
             X = np.arange(x1, x2, 0.2)
             Y = b + m * X
             if ii == 1:
-                targetlon = np.append(targetlon, x2)
-                targetlat = np.append(targetlat, y2)
-            targetlon = np.append(targetlon, X[::-1])
-            targetlat = np.append(targetlat, Y[::-1])
-    return targetlon, targetlat
+                targetlon.append([x2])
+                targetlat.append([y2])
+            targetlon.append(X[::-1])
+            targetlat.append(Y[::-1])
+    return np.concatenate(targetlon), np.concatenate(targetlat)
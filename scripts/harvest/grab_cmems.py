@@ -9,32 +9,80 @@ import os
 import xarray as xr
 
 
+class MotuOptions:
+    """
+    Options for motu_utils.motu_api.execute_request. The class attributes are the motuclient command line defaults
+    for the options that motu_api reads.
+    """
+    log_level = None
+    user = None
+    pwd = None
+    auth_mode = 'cas'
+    proxy_server = None
+    proxy_user = None
+    proxy_pwd = None
+    motu = None
+    service_id = None
+    product_id = None
+    date_min = None
+    date_max = None
+    latitude_min = None
+    latitude_max = None
+    longitude_min = None
+    longitude_max = None
+    depth_min = None
+    depth_max = None
+    variable = None
+    sync = False
+    describe = False
+    size = False
+    out_dir = '.'
+    out_name = 'data.nc'
+    block_size = 65536
+    socket_timeout = None
+    user_agent = None
+    outputWritten = None
+    console_mode = False
+
+    def __init__(self, options):
+        for name, value in options.items():
+            if not hasattr(MotuOptions, name):
+                raise AttributeError(f'Unknown motuclient option: {name}')
+            setattr(self, name, value)
+
+
 def download_ds(out_dir, out_name, st, et, coordlims, depth_max, user, pwd):
+    # import here so motuclient is only required when downloading CMEMS files
+    from motu_utils import motu_api
+
     url = 'http://nrt.cmems-du.eu/motu-web/Motu'
     service_id = 'GLOBAL_ANALYSIS_FORECAST_PHY_001_024-TDS'
     product_id = 'global-analysis-forecast-phy-001-024'
 
     os.makedirs(out_dir, exist_ok=True)
 
-    motuc = 'python -m motuclient --motu ' + url + \
-            ' --service-id ' + service_id + \
-            ' --product-id ' + product_id + \
-            ' --longitude-min ' + str(coordlims[0] - 1/6) + \
-            ' --longitude-max ' + str(coordlims[1] + 1/6) + \
-            ' --latitude-min ' + str(coordlims[2] - 1/6) + \
-            ' --latitude-max ' + str(coordlims[3] + 1/6) + \
-            ' --date-min ' + str(st - dt.timedelta(0.5)) + '"' + \
-            ' --date-max ' + str(et + dt.timedelta(0.5)) + '"' + \
-            ' --depth-min ' + '0.493' + \
-            ' --depth-max ' + str(depth_max) + \
-            ' --variable ' + 'thetao' + ' ' + \
-            ' --variable ' + 'so' + ' ' + \
-            ' --out-dir ' + out_dir + \
-            ' --out-name ' + out_name + ' ' + \
-            ' --user ' + user + ' ' + \
-            ' --pwd ' + pwd
-
-    os.system(motuc)
+    # call motuclient in this process instead of starting a new python interpreter for each download
+    motuc = MotuOptions(dict(
+        motu=url,
+        service_id=service_id,
+        product_id=product_id,
+        longitude_min=coordlims[0] - 1/6,
+        longitude_max=coordlims[1] + 1/6,
+        latitude_min=coordlims[2] - 1/6,
+        latitude_max=coordlims[3] + 1/6,
+        date_min=str(st - dt.timedelta(0.5)),
+        date_max=str(et + dt.timedelta(0.5)),
+        depth_min=0.493,
+        depth_max=depth_max,
+        variable=['thetao', 'so'],
+        out_dir=out_dir,
+        out_name=out_name,
+        auth_mode='cas',
+        user=user,
+        pwd=pwd
+    ))
+
+    motu_api.execute_request(motuc)
     print('\nCMEMS file downloaded to: {}'.format(os.path.join(out_dir, out_name)))
     return os.path.join(out_dir, out_name)
 
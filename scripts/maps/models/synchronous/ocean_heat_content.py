@@ -53,16 +53,13 @@ extent_list = []
 for region in conf.regions:
     extent_list.append(region_config(region)["extent"])
 
-extent_df = pd.DataFrame(
-    np.array(extent_list),
-    columns=['lonmin', 'lonmax', 'latmin', 'latmax']
-    )
+extents = np.array(extent_list)
 
 global_extent = [
-    extent_df.lonmin.min(),
-    extent_df.lonmax.max(),
-    extent_df.latmin.min(),
-    extent_df.latmax.max()
+    extents[:, 0].min(),
+    extents[:, 1].max(),
+    extents[:, 2].min(),
+    extents[:, 3].max()
     ]
 
 if conf.argo:
@@ -1,9 +1,14 @@
+import concurrent.futures
 import datetime as dt
+import hashlib
+import os
+import shutil
 
 import hurricanes.configs as conf
 import numpy as np
 import pandas as pd
-from hurricanes.calc import lon180to360, lon360to180
+import xarray as xr
+from hurricanes.calc import extent_to_ij, lon180to360, lon360to180
 from hurricanes.models import gofs, rtofs, cmems, amseas
 from hurricanes.platforms import (get_active_gliders, 
                                   get_argo_floats_by_time,
@@ -18,15 +23,18 @@ import time
 startTime = time.time() # Start time to see how long the script took
 matplotlib.use('agg')
 
+parallel = True # utilize parallel processing?
+cache_hours = 1 # reuse argo/glider downloads made within this many hours
+
 # Set path to save plots
 path_save = (conf.path_plots / "maps")
 
 # initialize keyword arguments for map plots
-kwargs = dict()
-kwargs['transform'] = conf.projection
-kwargs['dpi'] = conf.dpi
-kwargs['overwrite'] = False
-kwargs['colorbar'] = True
+base_kwargs = dict()
+base_kwargs['transform'] = conf.projection
+base_kwargs['dpi'] = conf.dpi
+base_kwargs['overwrite'] = False
+base_kwargs['colorbar'] = True
 
 # For debug purposes. Comment this out when commiting to repo.
 # conf.regions = ['tropical_western_atlantic']
@@ -50,45 +58,70 @@ date_list = pd.date_range(date_start,
 # This is the initial time to start the search for argo/gliders
 search_start = date_list[0] - dt.timedelta(hours=conf.search_hours)
 
+# Argo/glider search window for each plot time
+search_window_t0s = (date_list - dt.timedelta(hours=conf.search_hours)).strftime(tstr)
+search_window_t1s = date_list.strftime(tstr)
+
 # Get extent for all configured regions to download argo/glider data one time
 extent_list = []
 for region in conf.regions:
     extent_list.append(region_config(region)["extent"])
 
-extent_df = pd.DataFrame(
-    np.array(extent_list),
-    columns=['lonmin', 'lonmax', 'latmin', 'latmax']
-    )
+extents = np.array(extent_list)
 
 global_extent = [
-    extent_df.lonmin.min(),
-    extent_df.lonmax.max(),
-    extent_df.latmin.min(),
-    extent_df.latmax.max()
+    extents[:, 0].min(),
+    extents[:, 1].max(),
+    extents[:, 2].min(),
+    extents[:, 3].max()
     ]
 
+def cached_download(name, func, *args, **kwargs):
+    """
+    Return the dataframe from an earlier download with the same arguments if it is recent enough. Otherwise download
+    it and save it to the cache for the next run.
+    """
+    key = hashlib.md5(f"{args}{kwargs}".encode()).hexdigest()
+    fname = conf.path_cache / f"{name}_{key}.parquet"
+    if fname.exists() and time.time() - fname.stat().st_mtime < cache_hours * 3600:
+        return pd.read_parquet(fname)
+
+    df = func(*args, **kwargs)
+    if not df.empty:
+        os.makedirs(conf.path_cache, exist_ok=True)
+        df.to_parquet(fname)
+    return df
+
+
+# The argo, glider and bathymetry downloads are independent, so run them at the same time
+with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+    if conf.argo:
+        argo_future = executor.submit(cached_download, 'argo', get_argo_floats_by_time,
+                                      global_extent, search_start, date_end)
+
+    if conf.gliders:
+        glider_future = executor.submit(cached_download, 'gliders', get_active_gliders,
+                                        global_extent, search_start, date_end, parallel=False)
+
+    if conf.bathy:
+        bathy_future = executor.submit(get_bathymetry, global_extent)
+
 if conf.argo:
-    argo_data = get_argo_floats_by_time(global_extent, search_start, date_end)
+    argo_data = argo_future.result()
 else:
     argo_data = pd.DataFrame()
 
 if conf.gliders:
-    glider_data = get_active_gliders(global_extent, search_start, date_end, parallel=False)
+    glider_data = glider_future.result()
 else:
     glider_data = pd.DataFrame()
 
 if conf.bathy:
-    bathy_data = get_bathymetry(global_extent)
+    bathy_data = bathy_future.result()
 
 # Load RTOFS DataSet
 rds = rtofs() 
 
-# Save rtofs lon and lat as variables to speed up indexing calculation
-grid_lons = rds.lon.values[0,:]
-grid_lats = rds.lat.values[:,0]
-grid_x = rds.x.values
-grid_y = rds.y.values
-
 # Load GOFS DataSet
 gds = gofs(rename=True)
 
@@ -98,160 +131,297 @@ cds = cmems(rename=True)
 # Load AMSEAS
 am = amseas(rename=True)
 
+def time_index(ds, times):
+    """
+    Return the integer index of each time in the dataset. Times that don't exist in the dataset are -1
+    """
+    model_times = ds.time.values
+    ind = np.searchsorted(model_times, times)
+    exists = ind < len(model_times)
+    exists[exists] = model_times[ind[exists]] == times[exists]
+    return np.where(exists, ind, -1)
+
+
+def time_window(ds, tind):
+    """
+    Narrow the dataset to the times being plotted. Returns the narrowed dataset and the index of each plot time
+    in it. Times that don't exist in the dataset are -1
+    """
+    valid = tind > -1
+    window_ind = np.full(tind.shape, -1)
+    window_ind[valid] = np.arange(valid.sum())
+    return ds.isel(time=tind[valid]), window_ind
+
+
+def model_run(ds):
+    """
+    Return an identifier of the newest model run in the dataset. The best time series aggregations (GOFS, AMSEAS)
+    record the run of each time in time_run. Otherwise, use the dataset's creation/modification attributes and the
+    extent of its time axis, which moves forward when a new run is added to the aggregation.
+    """
+    if 'time_run' in ds.variables:
+        return str(ds['time_run'].values.max())
+    attrs = [str(ds.attrs[k]) for k in ('date_created', 'date_modified', 'date_issued', 'history') if k in ds.attrs]
+    times = ds.time.values
+    return f"{attrs}{times.min() if times.size else None}{times.max() if times.size else None}{times.size}"
+
+
+# Identify the model runs before narrowing each model to the plotted times
+rds_run = model_run(rds)
+gds_run = model_run(gds)
+cds_run = model_run(cds)
+am_run = model_run(am)
+
+# Find the index of each plot time in each model once and narrow each model to those times up front,
+# so that time and space can be selected in one call
+rds, rds_tind = time_window(rds, time_index(rds, date_list.values))
+gds, gds_tind = time_window(gds, time_index(gds, date_list.values))
+cds, cds_tind = time_window(cds, time_index(cds, date_list.values))
+am, am_tind = time_window(am, time_index(am, date_list.values))
+
+
+# Only the variables and depths that are plotted in at least one region are cached
+plot_vars = {'u', 'v'}
+plot_depths = set()
+for item in conf.regions:
+    region = region_config(item)
+    for k, v in region['variables'].items():
+        plot_vars.add(k)
+        plot_depths.update(x['depth'] for x in v)
+    plot_depths.update(region['currents'].get('depths', []))
+plot_depths = sorted(plot_depths)
+
+
+def zarr_cache(ds, name, run, x, y, xdim='lon', ydim='lat'):
+    """
+    Subset the dataset to the plotted variables, the model depths nearest to the plotted depths, and the x/y index
+    slices, and open a local zarr copy of the subset. The copy is keyed on the model run and the subset, so each
+    model run is only downloaded once. Copies from older runs are removed.
+    """
+    if not ds.sizes['time']:
+        return ds
+
+    depth_ind = np.unique(ds.indexes['depth'].get_indexer(plot_depths, method='nearest'))
+    variables = [v for v in ds.data_vars if v in plot_vars]
+    ds = ds[variables].isel({'depth': depth_ind, xdim: x, ydim: y})
+
+    key = hashlib.md5(
+        f"{run}{global_extent}{ds.time.values.tolist()}{variables}{ds.depth.values.tolist()}".encode()
+        ).hexdigest()
+    fname = conf.path_cache / f"{name}_{key}.zarr"
+    if not fname.exists():
+        os.makedirs(conf.path_cache, exist_ok=True)
+
+        # Remove the copies of this model from older runs, and any partial copies
+        for old in conf.path_cache.glob(f"{name}_*"):
+            shutil.rmtree(old, ignore_errors=True)
+
+        ds = ds.chunk({'time': 1})
+
+        # Drop the encoding from the remote dataset so that zarr picks its own chunks
+        for var in ds.variables.values():
+            var.encoding = {}
+
+        # Write to a temporary location first so an interrupted download doesn't leave a partial cache
+        tmp = fname.with_suffix('.tmp')
+        ds.to_zarr(tmp, mode='w')
+        os.rename(tmp, fname)
+    # open without dask so that the forked plotting workers don't inherit dask's thread pool
+    return xr.open_zarr(fname, chunks=None)
+
+
+# Subset each model to the extent of all regions and cache it locally
+global_extended = np.add(global_extent, [-1, 1, -1, 1]).tolist()
+global_lon360 = lon180to360(global_extended[:2]).tolist() + global_extended[2:]
+
+rds = zarr_cache(rds, 'rtofs', rds_run, *extent_to_ij(global_extended, rds.lon.values[0,:], rds.lat.values[:,0]), 'x', 'y')
+gds = zarr_cache(gds, 'gofs', gds_run, *extent_to_ij(global_lon360, gds.lon.values, gds.lat.values))
+cds = zarr_cache(cds, 'cmems', cds_run, *extent_to_ij(global_extended, cds.lon.values, cds.lat.values))
+am = zarr_cache(am, 'amseas', am_run, *extent_to_ij(global_lon360, am.lon.values, am.lat.values))
+
+# Save rtofs lon and lat as variables to speed up indexing calculation
+grid_lons = rds.lon.values[0,:]
+grid_lats = rds.lat.values[:,0]
+
+def region_subset(df, extent):
+    """
+    Return the rows of a dataframe, sorted by longitude, that are within the extent. A binary search on longitude
+    narrows the data to a band before checking latitude.
+    """
+    lon = df['lon'].values
+    i0 = np.searchsorted(lon, extent[0], side='left')
+    i1 = np.searchsorted(lon, extent[1], side='right')
+    band = df.iloc[i0:i1]
+    return band[(extent[2] <= band['lat']) & (band['lat'] <= extent[3])].sort_index()
+
+
+# Sort the asset data by longitude once so it can be quickly subset to each region
+if not argo_data.empty:
+    argo_lon_sorted = argo_data.sort_values('lon')
+
+if not glider_data.empty:
+    glider_lon_sorted = glider_data.sort_values('lon')
+
+# The region configurations and the indexes/slices used to subset each model to a region don't change with time,
+# so find them once instead of for every time
+region_slices = dict()
+for item in conf.regions:
+    region = region_config(item)
+    extended = np.add(region['extent'], [-1, 1, -1, 1]).tolist()
+
+    lon360 = lon180to360(extended[:2]).tolist() + extended[2:] # convert from 180 to 360 lon
+
+    # Find the index slices of the area we want to subset in each model, so that time and space can be selected
+    # with a single .isel call
+    region_slices[item] = dict(
+        region=region,
+        extended=extended,
+        rtofs=extent_to_ij(extended, grid_lons, grid_lats),
+        gofs=extent_to_ij(lon360, gds.lon.values, gds.lat.values),
+        cmems=extent_to_ij(extended, cds.lon.values, cds.lat.values),
+        amseas=extent_to_ij(lon360, am.lon.values, am.lat.values)
+        )
+
+    # Bathymetry only depends on the region
+    if conf.bathy:
+        region_slices[item]['bathy'] = bathy_data.sel(
+            longitude=slice(extended[0], extended[1]),
+            latitude=slice(extended[2], extended[3])
+        ).load()
+
+    # Subset the asset data to the region here, it only needs to be subset to the search window for each time
+    if not argo_data.empty:
+        region_slices[item]['argo'] = region_subset(argo_lon_sorted, extended)
+
+    if not glider_data.empty:
+        region_slices[item]['gliders'] = region_subset(glider_lon_sorted, extended)
+
+
+def plot_time_region(i, item):
+    """
+    Subset each model and the asset data to a single time and region and plot the model comparisons
+    """
+    rdt_flag = rds_tind[i] > -1
+    gdt_flag = gds_tind[i] > -1
+    cdt_flag = cds_tind[i] > -1
+    amt_flag = am_tind[i] > -1
+
+    search_window_t0 = search_window_t0s[i]
+    search_window_t1 = search_window_t1s[i]
+
+    # Copy the keyword arguments so that region specific arguments don't carry over to other regions
+    kwargs = base_kwargs.copy()
+
+    subset = region_slices[item]
+    region = subset['region']
+    extent = region['extent']
+    print(f'Region: {region["name"]}, Extent: {extent}')
+    kwargs['path_save'] = path_save / region['folder']
+
+    if 'eez' in region:
+        kwargs["eez"] = region["eez"]
+
+    if region['currents']['bool']:
+        kwargs['currents'] = region['currents']
+
+    if 'figure' in region:
+        if 'legend' in region['figure']:
+            kwargs['cols'] = region['figure']['legend']['columns']
+
+        if 'figsize' in region['figure']:
+            kwargs['figsize'] = region['figure']['figsize']
+
+    if 'bathy' in subset:
+        kwargs['bathy'] = subset['bathy']
+
+    # Use .isel selector on time and space since we know indexes that we want to slice.
+    # Each subset is small, so load it once rather than reading lazily every time the plots access a variable.
+    if rdt_flag:
+        rds_sub = rds.isel(
+            time=rds_tind[i],
+            x=subset['rtofs'][0],
+            y=subset['rtofs'][1]
+            ).set_coords(['u', 'v']).load()
+
+    if gdt_flag:
+        gds_sub = gds.isel(
+            time=gds_tind[i],
+            lon=subset['gofs'][0],
+            lat=subset['gofs'][1]
+            ).set_coords(['u', 'v']).load()
+
+        # Convert from 0,360 lon to -180,180
+        gds_sub['lon'] = lon360to180(gds_sub['lon'])
+
+    if cdt_flag:
+        cds_sub = cds.isel(
+            time=cds_tind[i],
+            lon=subset['cmems'][0],
+            lat=subset['cmems'][1]
+            ).set_coords(['u', 'v']).load()
+
+    if amt_flag:
+        am_sub = am.isel(
+            time=am_tind[i],
+            lon=subset['amseas'][0],
+            lat=subset['amseas'][1]
+            ).set_coords(['u', 'v']).load()
+
+    # Check if any asset data was downloaded and subset it to the 
+    # region and time being plotted
+    # The region subsets are sorted by (platform, time), so the time window can be sliced from the index
+    idx = pd.IndexSlice
+
+    # ARGO
+    if not argo_data.empty:
+        argo_region = subset['argo']
+        kwargs['argo'] = argo_region.loc[idx[:, search_window_t0:search_window_t1], :]
+
+    # Gliders
+    if not glider_data.empty:
+        glider_region = subset['gliders']
+        kwargs['gliders'] = glider_region.loc[idx[:, search_window_t0:search_window_t1], :]
+
+    try:
+        if rdt_flag and gdt_flag:
+            plot_model_region_comparison(rds_sub, gds_sub, region, **kwargs)
+            plot_model_region_comparison_streamplot(rds_sub, gds_sub, region, **kwargs)
+
+        if rdt_flag and cdt_flag:
+            plot_model_region_comparison(rds_sub, cds_sub, region, **kwargs)
+            plot_model_region_comparison_streamplot(rds_sub, cds_sub, region, **kwargs)
+
+        if rdt_flag and amt_flag:
+            plot_model_region_comparison(rds_sub, am_sub, region, **kwargs)
+            plot_model_region_comparison_streamplot(rds_sub, am_sub, region, **kwargs) 
+    except Exception as e:
+        print(e)
+
+
 def main():
     # Loop through times
-    for ctime in date_list:
+    for i, ctime in enumerate(date_list):
         print(f"Checking if {ctime} exists for each model.")
-        try:
-            rdt = rds.sel(time=ctime)
-            print(f"RTOFS: True")
-            rdt_flag = True
-        except KeyError as error:
-            print(f"RTOFS: False - {error}")
-            rdt_flag = False
-        
-        try:
-            gdt = gds.sel(time=ctime)
-            print(f"GOFS: True")
-            gdt_flag = True
-        except KeyError as error:
-            print(f"GOFS: False - {error}")
-            gdt_flag = False
-        
-        try:
-            cdt = cds.sel(time=ctime)
-            print(f"CMEMS: True")
-            cdt_flag = True
-        except KeyError as error:
-            print(f"CMEMS: False - {error}")
-            cdt_flag = False
-
-        try:
-            amt = am.sel(time=ctime)
-            print(f"AMSEAS: True")
-            amt_flag = True
-        except KeyError as error:
-            print(f"AMSEAS: False - {error}")
-            amt_flag = False
+        print(f"RTOFS: {rds_tind[i] > -1}")
+        print(f"GOFS: {gds_tind[i] > -1}")
+        print(f"CMEMS: {cds_tind[i] > -1}")
+        print(f"AMSEAS: {am_tind[i] > -1}")
         print("\n")
-            
-        search_window_t0 = (ctime - dt.timedelta(hours=conf.search_hours)).strftime(tstr)
-        search_window_t1 = ctime.strftime(tstr) 
-        
-        # Loop through regions
-        for item in conf.regions:
-            region = region_config(item)
-            extent = region['extent']
-            print(f'Region: {region["name"]}, Extent: {extent}')
-            kwargs['path_save'] = path_save / region['folder']
-
-            if 'eez' in region:
-                kwargs["eez"] = region["eez"]
-
-            if region['currents']['bool']:
-                kwargs['currents'] = region['currents']
-
-            if 'figure' in region:
-                if 'legend' in region['figure']:
-                    kwargs['cols'] = region['figure']['legend']['columns']
-
-                if 'figsize' in region['figure']:
-                    kwargs['figsize'] = region['figure']['figsize']
-
-            try:
-                kwargs['bathy'] = bathy_data.sel(
-                    longitude=slice(extent[0] - 1, extent[1] + 1),
-                    latitude=slice(extent[2] - 1, extent[3] + 1)
-                )
-            except NameError:
+
+    # Each time and region is plotted independently
+    times = [i for i in range(len(date_list)) for item in conf.regions]
+    regions = [item for i in range(len(date_list)) for item in conf.regions]
+
+    if parallel:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=6) as executor:
+            # consume the results so that errors raised in the workers aren't silently dropped
+            for _ in executor.map(plot_time_region, times, regions):
                 pass
-                    
-            extended = np.add(extent, [-1, 1, -1, 1]).tolist()
-
-            # Find x, y indexes of the area we want to subset
-            lons_ind = np.interp(extended[:2], grid_lons, grid_x)
-            lats_ind = np.interp(extended[2:], grid_lats, grid_y)
-
-            # Use np.floor on the 1st index and np.ceil on the 2nd index of each slice 
-            # in order to widen the area of the extent slightly.
-            extent_ind = [
-                np.floor(lons_ind[0]).astype(int),
-                np.ceil(lons_ind[1]).astype(int),
-                np.floor(lats_ind[0]).astype(int),
-                np.ceil(lats_ind[1]).astype(int)
-                ]
-            
-            # Use .isel selector on x/y since we know indexes that we want to slice
-            rds_sub = rdt.isel(
-                x=slice(extent_ind[0], extent_ind[1]), 
-                y=slice(extent_ind[2], extent_ind[3])
-                ).set_coords(['u', 'v'])
-            
-            # subset dataset to the proper extents for each region
-            lon360 = lon180to360(extended[:2]) # convert from 360 to 180 lon
-            gds_sub = gdt.sel(
-                lon=slice(lon360[0], lon360[1]),
-                lat=slice(extended[2], extended[3])
-            ).set_coords(['u', 'v'])
-            
-            # Convert from 0,360 lon to -180,180
-            gds_sub['lon'] = lon360to180(gds_sub['lon'])
-
-            if cdt_flag:
-                cds_sub = cdt.sel(
-                    lon=slice(extended[0], extended[1]),
-                    lat=slice(extended[2], extended[3])
-                ).set_coords(['u', 'v'])
-
-            am_sub = amt.sel(
-                lon=slice(lon360[0], lon360[1]),
-                lat=slice(extended[2], extended[3])
-            ).set_coords(['u', 'v'])
-
-            # Check if any asset data was downloaded and subset it to the 
-            # region and time being plotted
-            # ARGO
-            if not argo_data.empty:
-                argo_lon = argo_data['lon']
-                argo_lat = argo_data['lat']
-                argo_region = argo_data[
-                    (extended[0] <= argo_lon) & (argo_lon <= extended[1]) & (extended[2] <= argo_lat) & (argo_lat <= extended[3])
-                ]
-                argo_region.sort_index(inplace=True)
-                idx = pd.IndexSlice
-                kwargs['argo'] = argo_region.loc[idx[:, search_window_t0:search_window_t1], :]
-
-            # Gliders
-            if not glider_data.empty:
-                glider_lon = glider_data['lon']
-                glider_lat = glider_data['lat']
-                glider_region = glider_data[
-                    (extended[0] <= glider_lon) & (glider_lon <= extended[1]) & (extended[2] <= glider_lat) & (glider_lat <= extended[3])
-                    ]
-                glider_region = glider_region[
-                    (search_window_t0 <= glider_region.index.get_level_values('time'))
-                    &
-                    (glider_region.index.get_level_values('time') <= search_window_t1)
-                    ]
-                kwargs['gliders'] = glider_region
-                
-            try:
-                if rdt_flag and gdt_flag:
-                    plot_model_region_comparison(rds_sub, gds_sub, region, **kwargs)
-                    plot_model_region_comparison_streamplot(rds_sub, gds_sub, region, **kwargs)
-
-                if rdt_flag and cdt_flag:
-                    plot_model_region_comparison(rds_sub, cds_sub, region, **kwargs)
-                    plot_model_region_comparison_streamplot(rds_sub, cds_sub, region, **kwargs)
-
-                if rdt_flag and amt_flag:
-                    plot_model_region_comparison(rds_sub, am_sub, region, **kwargs)
-                    plot_model_region_comparison_streamplot(rds_sub, am_sub, region, **kwargs) 
-            except Exception as e:
-                print(e)
-                continue
- 
+    else:
+        for i, item in zip(times, regions):
+            plot_time_region(i, item)
+
 
 if __name__ == "__main__":
     main()
-    print('Execution time in seconds: ' + str(time.time() - startTime))
\ No newline at end of file
+    print('Execution time in seconds: ' + str(time.time() - startTime))
@@ -52,16 +52,13 @@ extent_list = []
 for region in conf.regions:
     extent_list.append(region_config(region)["extent"])
 
-extent_df = pd.DataFrame(
-    np.array(extent_list),
-    columns=['lonmin', 'lonmax', 'latmin', 'latmax']
-    )
+extents = np.array(extent_list)
 
 global_extent = [
-    extent_df.lonmin.min(),
-    extent_df.lonmax.max(),
-    extent_df.latmin.min(),
-    extent_df.latmax.max()
+    extents[:, 0].min(),
+    extents[:, 1].max(),
+    extents[:, 2].min(),
+    extents[:, 3].max()
     ]
 
 if conf.argo:
@@ -224,20 +221,16 @@ def plot_ctime(ctime):
 
         # Subset downloaded glider data to this region and time
         if not glider_data.empty:
-            lon = glider_data['lon']
-            lat = glider_data['lat']
+            # Slice out the time window first, glider data is sorted by (glider, time)
+            idx = pd.IndexSlice
+            glider_region = glider_data.loc[idx[:, search_window_t0:search_window_t1], :]
+
+            lon = glider_region['lon']
+            lat = glider_region['lat']
 
             # Mask out anything beyond the extent
             mask = (extent[0] <= lon) & (lon < extent[1]) & (extent[2] < lat) & (lat <= extent[3])
-            glider_region = glider_data[mask]
-
-            # Mask out any glider floats beyond the time window
-            glider_region = glider_region[
-                (search_window_t0 <= glider_region.index.get_level_values('time'))
-                &
-                (glider_region.index.get_level_values('time') <= search_window_t1)
-                ]
-            kwargs['gliders'] = glider_region
+            kwargs['gliders'] = glider_region[mask]
             
         try:
             if rdt_flag:
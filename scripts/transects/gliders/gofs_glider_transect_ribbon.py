@@ -6,6 +6,7 @@ Last modified: Lori Garzio on 5/14/2021
 Create transect "ribbons" of GOFS along user-specified glider(s) tracks. Model transect is in space and time.
 """
 import cmocean
+import concurrent.futures
 import numpy as np
 import pandas as pd
 import xarray as xr
@@ -30,15 +31,28 @@ def main(gliders, save_dir, g_t0, g_t1, ylims, color_lims):
         sdir_glider = os.path.join(save_dir, glider, 'transects', 'transect-ribbons')
         os.makedirs(sdir_glider, exist_ok=True)
         glider_df = gld.glider_dataset(glider, **gargs)
-        gl_t0 = pd.to_datetime(np.nanmin(glider_df['time']))
-        gl_t1 = pd.to_datetime(np.nanmax(glider_df['time']))
+
+        # Convert the glider track to numpy arrays once, with time as integer nanoseconds for interpolation
+        track_time = pd.to_datetime(glider_df['time']).values.astype('datetime64[ns]')
+        track_lon = glider_df['longitude'].values
+        track_lat = glider_df['latitude'].values
+
+        gl_t0 = pd.to_datetime(np.nanmin(track_time))
+        gl_t1 = pd.to_datetime(np.nanmax(track_time))
+        track_time = track_time.astype('int64')
         gl_t0str = gl_t0.strftime('%Y-%m-%dT%H:%M')
         gl_t1str = gl_t1.strftime('%Y-%m-%dT%H:%M')
         gl_t0save = gl_t0.strftime('%Y%m%dT%H%M')
         glider_name = glider.split('-')[0]
 
-        with xr.open_dataset(url, drop_variables='tau') as gofs:
-            gofs = gofs.rename({'surf_el': 'sea_surface_height', 'water_temp': 'temperature', 'water_u': 'u', 'water_v': 'v'})
+        # only temperature and salinity are used for the transects
+        drop = ['tau', 'surf_el', 'water_u', 'water_v',
+                'water_temp_bottom', 'salinity_bottom', 'water_u_bottom', 'water_v_bottom']
+        # open lazily with one dask chunk per model profile, so only the profiles along the track are requested.
+        # pydap reads without the global netCDF lock, so dask can request the profiles concurrently
+        with xr.open_dataset(url, drop_variables=drop, engine='pydap',
+                             chunks={'time': 1, 'depth': -1, 'lat': 1, 'lon': 1}) as gofs:
+            gofs = gofs.rename({'water_temp': 'temperature'})
 
             # Subset time range (add a little extra to the glider time range)
             mt0 = gl_t0 - dt.timedelta(hours=1)
@@ -49,17 +63,24 @@ def main(gliders, save_dir, g_t0, g_t1, ylims, color_lims):
             model_t1str = pd.to_datetime(np.nanmax(ds.time.values)).strftime('%Y-%m-%dT%H:%M')
 
             # interpolate glider lat/lon to lat/lon on model time
-            sublonm = np.interp(pd.to_datetime(ds.time.values), pd.to_datetime(glider_df.time), glider_df.longitude)
-            sublatm = np.interp(pd.to_datetime(ds.time.values), pd.to_datetime(glider_df.time), glider_df.latitude)
+            model_time = ds.time.values.astype('datetime64[ns]').astype('int64')
+            sublonm = np.interp(model_time, track_time, track_lon)
+            sublatm = np.interp(model_time, track_time, track_lat)
             sublonm_GOFS = storms.convert_target_gofs_lon(sublonm)
 
-            # get temperature and salinity data along the glider track (space and time)
-            mtemp = np.full([len(ds.depth), len(ds.time)], np.nan)
-            msalt = np.full([len(ds.depth), len(ds.time)], np.nan)
-            for i, t in enumerate(ds.time):
-                tds = ds.sel(time=t, lon=sublonm_GOFS[i], lat=sublatm[i], method='nearest')
-                mtemp[:, i] = tds['temperature'].values
-                msalt[:, i] = tds['salinity'].values
+            # find the nearest model grid point to the glider track at each model time
+            lon_ind = ds.indexes['lon'].get_indexer(sublonm_GOFS, method='nearest')
+            lat_ind = ds.indexes['lat'].get_indexer(sublatm, method='nearest')
+
+            # get temperature and salinity data along the glider track (space and time) in a single pointwise
+            # selection. each point is one dask chunk, so dask requests the profiles concurrently
+            ti = xr.DataArray(np.arange(len(ds.time)), dims='points')
+            lati = xr.DataArray(lat_ind, dims='points')
+            loni = xr.DataArray(lon_ind, dims='points')
+            profiles = ds[['temperature', 'salinity']].isel(time=ti, lat=lati, lon=loni)
+            profiles = profiles.compute(scheduler='threads', num_workers=8)
+            mtemp = profiles['temperature'].transpose('depth', 'points').values
+            msalt = profiles['salinity'].transpose('depth', 'points').values
 
             # get the temperature transect from the glider
             gl_tm, gl_lon, gl_lat, gl_depth, gl_temp = gld.grid_glider_data(glider_df, 'temperature', 0.5)
@@ -74,14 +95,14 @@ def main(gliders, save_dir, g_t0, g_t1, ylims, color_lims):
             targs['levels'] = color_lims['temp']
             targs['ylims'] = ylims
             targs['xlab'] = 'Time'
-            plot_transect(ds.time.values, ds.depth.values, mtemp, **targs)
+            plots = [(plot_transect, (ds.time.values, ds.depth.values, mtemp), targs.copy())]
 
             # plot temperature by time (glider time/location) - model and glider
             del targs['title']
             targs['title0'] = f'{glider_name} transect {gl_t0str} to {gl_t1str}'
             targs['title1'] = f'GOFS Temperature: {model_t0str} to {model_t1str}'
             targs['save_file'] = os.path.join(sdir_glider, f'{glider_name}_gofs_glider_transect_temp-{gl_t0save}.png')
-            plot_transects(gl_tm, gl_depth, gl_temp, ds.time.values, ds.depth.values, mtemp, **targs)
+            plots.append((plot_transects, (gl_tm, gl_depth, gl_temp, ds.time.values, ds.depth.values, mtemp), targs))
 
             # get the salinity transect from the glider
             gl_tm, gl_lon, gl_lat, gl_depth, gl_salt = gld.grid_glider_data(glider_df, 'salinity', 0.5)
@@ -96,14 +117,21 @@ def main(gliders, save_dir, g_t0, g_t1, ylims, color_lims):
             sargs['levels'] = color_lims['salt']
             sargs['ylims'] = ylims
             sargs['xlab'] = 'Time'
-            plot_transect(ds.time.values, ds.depth.values, msalt, **sargs)
+            plots.append((plot_transect, (ds.time.values, ds.depth.values, msalt), sargs.copy()))
 
             # plot salinity by time (glider time/location) - model and glider
             del sargs['title']
             sargs['title0'] = f'{glider_name} transect {gl_t0str} to {gl_t1str}'
             sargs['title1'] = f'GOFS Salinity: {model_t0str} to {model_t1str}'
             sargs['save_file'] = os.path.join(sdir_glider, f'{glider_name}_gofs_glider_transect_salt-{gl_t0save}.png')
-            plot_transects(gl_tm, gl_depth, gl_salt, ds.time.values, ds.depth.values, msalt, **sargs)
+            plots.append((plot_transects, (gl_tm, gl_depth, gl_salt, ds.time.values, ds.depth.values, msalt), sargs))
+
+            # the plots don't depend on each other, so render them in parallel. pyplot isn't thread safe, so use
+            # processes rather than threads
+            with concurrent.futures.ProcessPoolExecutor(max_workers=4) as executor:
+                futures = [executor.submit(func, *args, **kwargs) for func, args, kwargs in plots]
+                for future in futures:
+                    future.result()
 
 
 if __name__ == '__main__':